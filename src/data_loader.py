@@ -2,8 +2,146 @@
 数据加载模块
 负责加载和预处理CVE漏洞数据
 """
+import os
+import tempfile
 import pandas as pd
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = None
+
+CSV_BLOCK_SIZE = 16 << 20
+
+# 与 pd.read_csv 默认识别的缺失值一致，PyArrow 读取时字符串列中的这些值同样记为空值
+CSV_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+# publishedDate 按字符串读取，再由 pd.to_datetime 统一解析，格式不一致或非法的日期记为空值
+CVE_COLUMN_TYPES = {
+    'publishedDate': 'string',
+    'baseScore': 'float64',
+    'v3_base_score': 'float64',
+}
+
+SEVERITY_LEVELS = ['NONE', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+
+CVE_COLUMNS = ['cveId', 'publishedDate', 'year', 'baseScore', 'baseSeverity']
+
+# 读取CSV时仅解析以下列，其余描述、参考链接等列不进入内存
+CVE_SOURCE_COLUMNS = [
+    'cveId', 'publishedDate', 'baseScore', 'baseSeverity', 'v3_base_score', 'v3_base_severity'
+]
+CPE_SOURCE_COLUMNS = ['cpe23Uri']
+JUNCTION_SOURCE_COLUMNS = ['cveId', 'cpe23Uri']
+
+# 合并数据中保留的CVE、CPE列
+MERGED_CVE_COLUMNS = ['cveId', 'year', 'baseScore', 'baseSeverity']
+MERGED_CPE_COLUMNS = ['cpe23Uri', 'vendor', 'product', 'version']
+
+# cpe:2.3:part:vendor:product:version:... 中依次捕获 vendor、product、version
+CPE_URI_PATTERN = r'^(?:[^:]*:){3}([^:]*):([^:]*)(?::([^:]*))?'
+
+DICTIONARY_COLUMNS = ['vendor', 'product', 'baseSeverity']
+
+# 缓存数据的列组成或排序方式变化时递增，旧版本缓存在读取时视为未命中
+CACHE_VERSION = '5'
+CACHE_VERSION_KEY = b'supply_chain_risk.cache_version'
+
+
+def _read_csv(filepath: str, columns: List[str], column_types: Optional[dict] = None) -> pd.DataFrame:
+    """读取CSV文件中存在的指定列，优先使用PyArrow多线程解析，未安装PyArrow时使用C引擎"""
+    header = pd.read_csv(filepath, nrows=0).columns
+    usecols = [c for c in columns if c in header]
+    if pa is not None:
+        types = {name: pa.type_for_alias(kind) for name, kind in (column_types or {}).items()}
+        table = pa_csv.read_csv(
+            filepath,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=types,
+                include_columns=usecols,
+                null_values=CSV_NULL_VALUES,
+                strings_can_be_null=True
+            )
+        )
+        return table.to_pandas(self_destruct=True, split_blocks=True)
+    return pd.read_csv(filepath, usecols=usecols, low_memory=False)
+
+
+def merge_data(junction_data: pd.DataFrame, cve_data: pd.DataFrame,
+               cpe_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """合并关联表与CVE、CPE数据，合并前仅保留分析所需的列，并校验CVE、CPE表的键唯一"""
+    cve_cols = [c for c in MERGED_CVE_COLUMNS if c in cve_data.columns]
+    merged = junction_data[['cveId', 'cpe23Uri']].merge(
+        cve_data[cve_cols], on='cveId', how='left', sort=False, validate='m:1'
+    )
+    if cpe_data is not None:
+        cpe_cols = [c for c in MERGED_CPE_COLUMNS if c in cpe_data.columns]
+        merged = merged.merge(
+            cpe_data[cpe_cols], on='cpe23Uri', how='left', sort=False, validate='m:1'
+        )
+    return merged
+
+
+def _to_severity(values: pd.Series) -> pd.Series:
+    """统一严重程度大小写并转换为有序分类，空白值记为缺失，标准等级之外的取值保留为排在最前的额外分类"""
+    severity = values.astype('string').str.strip().str.upper().replace('', pd.NA)
+    unknown = sorted(set(severity.dropna().unique()) - set(SEVERITY_LEVELS))
+    return severity.astype(pd.CategoricalDtype(unknown + SEVERITY_LEVELS, ordered=True))
+
+
+def _cache_path(filepath: str) -> str:
+    """CSV文件对应的Parquet缓存路径"""
+    return os.path.splitext(filepath)[0] + '.parquet'
+
+
+def _read_cache(filepath: str) -> Optional[pd.DataFrame]:
+    """读取Parquet缓存，缓存不存在、早于CSV文件、版本不符或已损坏时返回None"""
+    if pa is None:
+        return None
+    cache = _cache_path(filepath)
+    if not os.path.exists(cache) or os.path.getmtime(cache) < os.path.getmtime(filepath):
+        return None
+    try:
+        metadata = pq.read_schema(cache).metadata or {}
+        if metadata.get(CACHE_VERSION_KEY) != CACHE_VERSION.encode():
+            return None
+        return pq.read_table(cache, memory_map=True).to_pandas()
+    except (OSError, pa.ArrowException):
+        return None
+
+
+def _write_cache(filepath: str, df: pd.DataFrame) -> None:
+    """将解析后的数据写入Parquet缓存，先写临时文件再原子替换，写入失败不影响分析流程"""
+    if pa is None:
+        return
+    cache = _cache_path(filepath)
+    tmp_path = None
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            CACHE_VERSION_KEY: CACHE_VERSION.encode()
+        })
+        fd, tmp_path = tempfile.mkstemp(suffix='.parquet.tmp', dir=os.path.dirname(cache) or '.')
+        os.close(fd)
+        pq.write_table(
+            table,
+            tmp_path,
+            compression='zstd',
+            use_dictionary=[c for c in DICTIONARY_COLUMNS if c in df.columns]
+        )
+        os.replace(tmp_path, cache)
+    except (OSError, pa.ArrowException):
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 class DataLoader:
@@ -14,30 +152,49 @@ class DataLoader:
         self._cve_data = None
         self._cpe_data = None
         self._junction_data = None
+        self._merged = None
 
     def load_cve_data(self, filepath: str) -> pd.DataFrame:
         """加载CVE漏洞数据"""
-        df = pd.read_csv(filepath, low_memory=False)
+        df = _read_cache(filepath)
+        if df is None:
+            df = self._parse_cve_csv(filepath)
+            _write_cache(filepath, df)
+        self._cve_data = df
+        self._merged = None
+        return df
+
+    def _parse_cve_csv(self, filepath: str) -> pd.DataFrame:
+        """解析CVE漏洞CSV，仅保留后续分析用到的列"""
+        df = _read_csv(filepath, CVE_SOURCE_COLUMNS, CVE_COLUMN_TYPES)
         df['publishedDate'] = pd.to_datetime(df['publishedDate'], errors='coerce')
         df['year'] = df['publishedDate'].dt.year
         if 'v3_base_score' in df.columns:
             df['baseScore'] = df['v3_base_score']
         if 'v3_base_severity' in df.columns:
             df['baseSeverity'] = df['v3_base_severity']
-        self._cve_data = df
-        return df
+        if 'baseSeverity' in df.columns:
+            df['baseSeverity'] = _to_severity(df['baseSeverity'])
+        return df[[c for c in CVE_COLUMNS if c in df.columns]]
 
     def load_cpe_data(self, filepath: str) -> pd.DataFrame:
         """加载CPE软件标识数据"""
-        df = pd.read_csv(filepath)
-        df = self._parse_cpe_uri(df)
+        df = _read_cache(filepath)
+        if df is None:
+            df = self._parse_cpe_uri(_read_csv(filepath, CPE_SOURCE_COLUMNS))
+            _write_cache(filepath, df)
         self._cpe_data = df
+        self._merged = None
         return df
 
     def load_junction_data(self, filepath: str) -> pd.DataFrame:
         """加载CVE-CPE关联数据"""
-        df = pd.read_csv(filepath)
+        df = _read_cache(filepath)
+        if df is None:
+            df = _read_csv(filepath, JUNCTION_SOURCE_COLUMNS)
+            _write_cache(filepath, df)
         self._junction_data = df
+        self._merged = None
         return df
 
     def _parse_cpe_uri(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -45,39 +202,32 @@ class DataLoader:
         if 'cpe23Uri' not in df.columns:
             return df
 
-        parsed = df['cpe23Uri'].str.split(':', expand=True)
-        if parsed.shape[1] >= 5:
-            df['vendor'] = parsed[3]
-            df['product'] = parsed[4]
-        if parsed.shape[1] >= 6:
-            df['version'] = parsed[5]
+        uris = df['cpe23Uri']
+        if pa is not None:
+            uris = uris.astype(pd.StringDtype('pyarrow'))
+
+        parsed = uris.str.extract(CPE_URI_PATTERN, expand=True)
+        for i, name in enumerate(['vendor', 'product', 'version']):
+            df[name] = parsed[i].astype('category')
         return df
 
     def get_merged_data(self) -> Optional[pd.DataFrame]:
-        """获取合并后的完整数据"""
+        """获取合并后的完整数据，结果会被缓存直到重新加载任一数据"""
         if self._cve_data is None or self._junction_data is None:
             return None
+        if self._merged is not None:
+            return self._merged
 
-        merged = self._junction_data.merge(
-            self._cve_data,
-            on='cveId',
-            how='left'
-        )
-
-        if self._cpe_data is not None:
-            merged = merged.merge(
-                self._cpe_data,
-                on='cpe23Uri',
-                how='left'
-            )
+        merged = merge_data(self._junction_data, self._cve_data, self._cpe_data)
+        self._merged = merged
         return merged
 
     def get_statistics(self) -> dict:
-        """获取数据基本统计信息"""
+        """获取数据基本统计信息，年份与厂商分布仅保留数量最多的前若干项"""
         stats = {}
         if self._cve_data is not None:
             stats['total_cves'] = len(self._cve_data)
-            stats['cve_years'] = self._cve_data['year'].value_counts().to_dict()
+            stats['cve_years'] = self._cve_data['year'].value_counts().head(20).to_dict()
         if self._cpe_data is not None:
             stats['total_cpes'] = len(self._cpe_data)
             if 'vendor' in self._cpe_data.columns:
@@ -7,7 +7,6 @@ import sys
 
 from data_loader import DataLoader, load_all_data
 from risk_analyzer import RiskAnalyzer
-from visualizer import RiskVisualizer
 from report_generator import ReportGenerator
 
 
@@ -54,8 +53,14 @@ def main():
         print(f"  - 关联数据加载失败: {e}")
         sys.exit(1)
 
+    try:
+        merged_data = loader.get_merged_data()
+    except Exception as e:
+        print(f"  - 数据合并失败: {e}")
+        sys.exit(1)
+
     print("\n[2/4] 分析风险...")
-    analyzer = RiskAnalyzer(cve_data, cpe_data, junction_data)
+    analyzer = RiskAnalyzer(cve_data, cpe_data, junction_data, merged=merged_data)
     risk_profile = analyzer.generate_risk_profile()
 
     print(f"  - 漏洞总数: {risk_profile['summary']['total_cves']}")
@@ -63,8 +68,8 @@ def main():
     print(f"  - 高风险产品: {len(risk_profile['top_risk_products'])} 个")
 
     print("\n[3/4] 生成可视化...")
+    from visualizer import RiskVisualizer
     visualizer = RiskVisualizer(args.output)
-    merged_data = loader.get_merged_data()
     chart_paths = visualizer.generate_all_charts(risk_profile, merged_data)
     print(f"  - 生成图表: {len(chart_paths)} 个")
 
@@ -4,9 +4,75 @@
 """
 import json
 import os
+import textwrap
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+# 报告模板在模块加载时定义一次，{sections} 为按需拼接的各章节，每个章节后空一行
+SUMMARY_REPORT_TEMPLATE = textwrap.dedent("""\
+    {rule}
+    开源依赖供应链风险分析报告
+    {rule}
+    生成时间: {now}
+
+    {sections}{rule}
+    报告结束
+    {rule}""")
+
+SUMMARY_OVERVIEW_TEMPLATE = textwrap.dedent("""\
+    【数据概览】
+      - 漏洞总数: {total_cves}
+      - 软件组件数: {total_cpes}""")
+
+MARKDOWN_REPORT_TEMPLATE = textwrap.dedent("""\
+    # 开源依赖供应链风险分析报告
+
+    **生成时间**: {now}
+
+    {sections}---
+    *本报告由供应链风险分析工具自动生成*""")
+
+MARKDOWN_OVERVIEW_TEMPLATE = textwrap.dedent("""\
+    ## 1. 数据概览
+
+    - **漏洞总数**: {total_cves}
+    - **软件组件数**: {total_cpes}""")
+
+MARKDOWN_TABLE_TEMPLATE = textwrap.dedent("""\
+    {title}
+
+    {header}
+    {separator}""")
+
+
+class _DefaultNA(dict):
+    """format_map 使用的映射，缺失字段渲染为 N/A"""
+
+    def __missing__(self, key):
+        return 'N/A'
+
+
+def _render_table(table: Dict[str, str]) -> str:
+    """渲染Markdown表格，没有数据行时只输出表头"""
+    text = MARKDOWN_TABLE_TEMPLATE.format_map(table)
+    return f"{text}\n{table['rows']}" if table['rows'] else text
+
+
+def _render_sections(sections: List[str]) -> str:
+    """拼接章节文本，每个章节后保留一个空行"""
+    return "".join(f"{section}\n\n" for section in sections)
+
 
 class ReportGenerator:
     """风险报告生成器"""
@@ -17,60 +83,55 @@ class ReportGenerator:
 
     def generate_summary_report(self, risk_profile: Dict) -> str:
         """生成摘要报告"""
-        report_lines = []
-        report_lines.append("=" * 60)
-        report_lines.append("开源依赖供应链风险分析报告")
-        report_lines.append("=" * 60)
-        report_lines.append(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report_lines.append("")
+        sections = []
 
         if 'summary' in risk_profile:
             summary = risk_profile['summary']
-            report_lines.append("【数据概览】")
-            report_lines.append(f"  - 漏洞总数: {summary.get('total_cves', 'N/A')}")
-            report_lines.append(f"  - 软件组件数: {summary.get('total_cpes', 'N/A')}")
-            report_lines.append("")
+            sections.append(SUMMARY_OVERVIEW_TEMPLATE.format_map(_DefaultNA(summary)))
 
             if 'severity_distribution' in summary:
-                report_lines.append("【严重程度分布】")
-                for severity, count in summary['severity_distribution'].items():
-                    report_lines.append(f"  - {severity}: {count}")
-                report_lines.append("")
+                sections.append("\n".join([
+                    "【严重程度分布】",
+                    *(f"  - {severity}: {count}" for severity, count in summary['severity_distribution'].items())
+                ]))
 
         if 'top_risk_vendors' in risk_profile:
-            report_lines.append("【高风险厂商 TOP 10】")
-            for i, vendor in enumerate(risk_profile['top_risk_vendors'][:10], 1):
-                report_lines.append(
+            sections.append("\n".join([
+                "【高风险厂商 TOP 10】",
+                *(
                     f"  {i}. {vendor['vendor']} - 风险评分: {vendor['risk_score']:.2f}, "
                     f"CVE数量: {vendor['cve_count']}"
+                    for i, vendor in enumerate(risk_profile['top_risk_vendors'][:10], 1)
                 )
-            report_lines.append("")
+            ]))
 
         if 'top_risk_products' in risk_profile:
-            report_lines.append("【高风险产品 TOP 10】")
-            for i, product in enumerate(risk_profile['top_risk_products'][:10], 1):
-                report_lines.append(
+            sections.append("\n".join([
+                "【高风险产品 TOP 10】",
+                *(
                     f"  {i}. {product['vendor']}/{product['product']} - "
                     f"风险评分: {product['risk_score']:.2f}"
+                    for i, product in enumerate(risk_profile['top_risk_products'][:10], 1)
                 )
-            report_lines.append("")
+            ]))
 
         if 'critical_components' in risk_profile:
             critical = risk_profile['critical_components'][:10]
             if critical:
-                report_lines.append("【严重漏洞组件】")
-                for comp in critical:
-                    report_lines.append(
+                sections.append("\n".join([
+                    "【严重漏洞组件】",
+                    *(
                         f"  - {comp['vendor']}/{comp['product']} ({comp['cve_id']}): "
                         f"评分 {comp['score']}"
+                        for comp in critical
                     )
-                report_lines.append("")
-
-        report_lines.append("=" * 60)
-        report_lines.append("报告结束")
-        report_lines.append("=" * 60)
+                ]))
 
-        report_text = "\n".join(report_lines)
+        report_text = SUMMARY_REPORT_TEMPLATE.format_map({
+            'rule': "=" * 60,
+            'now': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'sections': _render_sections(sections)
+        })
 
         filepath = os.path.join(self.output_dir, 'risk_report.txt')
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -86,83 +147,78 @@ class ReportGenerator:
         }
 
         filepath = os.path.join(self.output_dir, 'risk_report.json')
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        if orjson is not None:
+            Path(filepath).write_bytes(orjson.dumps(report, default=str, option=ORJSON_OPTIONS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2, default=str)
 
         return filepath
 
     def generate_markdown_report(self, risk_profile: Dict, chart_paths: List[str] = None) -> str:
         """生成Markdown格式报告"""
-        lines = []
-        lines.append("# 开源依赖供应链风险分析报告")
-        lines.append("")
-        lines.append(f"**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
+        sections = []
 
         if 'summary' in risk_profile:
             summary = risk_profile['summary']
-            lines.append("## 1. 数据概览")
-            lines.append("")
-            lines.append(f"- **漏洞总数**: {summary.get('total_cves', 'N/A')}")
-            lines.append(f"- **软件组件数**: {summary.get('total_cpes', 'N/A')}")
-            lines.append("")
+            sections.append(MARKDOWN_OVERVIEW_TEMPLATE.format_map(_DefaultNA(summary)))
 
             if 'severity_distribution' in summary:
-                lines.append("### 严重程度分布")
-                lines.append("")
-                lines.append("| 严重程度 | 数量 |")
-                lines.append("|---------|------|")
-                for severity, count in summary['severity_distribution'].items():
-                    lines.append(f"| {severity} | {count} |")
-                lines.append("")
+                sections.append(_render_table({
+                    'title': "### 严重程度分布",
+                    'header': "| 严重程度 | 数量 |",
+                    'separator': "|---------|------|",
+                    'rows': "\n".join(
+                        f"| {severity} | {count} |"
+                        for severity, count in summary['severity_distribution'].items()
+                    )
+                }))
 
         if 'top_risk_vendors' in risk_profile:
-            lines.append("## 2. 高风险厂商分析")
-            lines.append("")
-            lines.append("| 排名 | 厂商 | 风险评分 | CVE数量 | 严重漏洞数 |")
-            lines.append("|------|------|----------|---------|------------|")
-            for i, vendor in enumerate(risk_profile['top_risk_vendors'][:15], 1):
-                lines.append(
+            sections.append(_render_table({
+                'title': "## 2. 高风险厂商分析",
+                'header': "| 排名 | 厂商 | 风险评分 | CVE数量 | 严重漏洞数 |",
+                'separator': "|------|------|----------|---------|------------|",
+                'rows': "\n".join(
                     f"| {i} | {vendor['vendor']} | {vendor['risk_score']:.2f} | "
                     f"{vendor['cve_count']} | {vendor.get('critical_count', 0)} |"
+                    for i, vendor in enumerate(risk_profile['top_risk_vendors'][:15], 1)
                 )
-            lines.append("")
+            }))
 
         if 'top_risk_products' in risk_profile:
-            lines.append("## 3. 高风险产品分析")
-            lines.append("")
-            lines.append("| 排名 | 厂商 | 产品 | 风险评分 | CVE数量 |")
-            lines.append("|------|------|------|----------|---------|")
-            for i, product in enumerate(risk_profile['top_risk_products'][:15], 1):
-                lines.append(
+            sections.append(_render_table({
+                'title': "## 3. 高风险产品分析",
+                'header': "| 排名 | 厂商 | 产品 | 风险评分 | CVE数量 |",
+                'separator': "|------|------|------|----------|---------|",
+                'rows': "\n".join(
                     f"| {i} | {product['vendor']} | {product['product']} | "
                     f"{product['risk_score']:.2f} | {product['cve_count']} |"
+                    for i, product in enumerate(risk_profile['top_risk_products'][:15], 1)
                 )
-            lines.append("")
+            }))
 
         if 'yearly_trend' in risk_profile and risk_profile['yearly_trend']:
-            lines.append("## 4. 年度趋势分析")
-            lines.append("")
-            lines.append("| 年份 | CVE数量 | 平均严重程度 |")
-            lines.append("|------|---------|--------------|")
-            for item in risk_profile['yearly_trend'][-10:]:
-                lines.append(
+            sections.append(_render_table({
+                'title': "## 4. 年度趋势分析",
+                'header': "| 年份 | CVE数量 | 平均严重程度 |",
+                'separator': "|------|---------|--------------|",
+                'rows': "\n".join(
                     f"| {int(item['year'])} | {item['cve_count']} | {item['avg_severity']:.2f} |"
+                    for item in risk_profile['yearly_trend'][-10:]
                 )
-            lines.append("")
+            }))
 
         if chart_paths:
-            lines.append("## 5. 可视化图表")
-            lines.append("")
-            for path in chart_paths:
-                filename = os.path.basename(path)
-                lines.append(f"![{filename}]({filename})")
-                lines.append("")
-
-        lines.append("---")
-        lines.append("*本报告由供应链风险分析工具自动生成*")
-
-        report_text = "\n".join(lines)
+            sections.append("\n\n".join([
+                "## 5. 可视化图表",
+                *(f"![{os.path.basename(path)}]({os.path.basename(path)})" for path in chart_paths)
+            ]))
+
+        report_text = MARKDOWN_REPORT_TEMPLATE.format_map({
+            'now': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'sections': _render_sections(sections)
+        })
 
         filepath = os.path.join(self.output_dir, 'risk_report.md')
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -4,9 +4,12 @@
 """
 import pandas as pd
 import numpy as np
+from functools import cached_property
 from typing import Dict, List, Optional
 from collections import defaultdict
 
+from data_loader import merge_data
+
 
 class RiskAnalyzer:
     """供应链风险分析器"""
@@ -19,58 +22,65 @@ class RiskAnalyzer:
         'NONE': 0.0
     }
 
-    def __init__(self, cve_data: pd.DataFrame, cpe_data: pd.DataFrame, junction_data: pd.DataFrame):
+    RISK_FACTORS = ['cve_count', 'avg_score', 'max_score', 'critical_count']
+    VENDOR_RISK_WEIGHTS = np.array([0.3, 0.25, 0.15, 0.3])
+    PRODUCT_RISK_WEIGHTS = np.array([0.35, 0.25, 0.15, 0.25])
+
+    def __init__(self, cve_data: pd.DataFrame, cpe_data: pd.DataFrame, junction_data: pd.DataFrame,
+                 merged: Optional[pd.DataFrame] = None):
         self.cve_data = cve_data
         self.cpe_data = cpe_data
         self.junction_data = junction_data
+        self._shared_merged = merged
         self._risk_scores = {}
 
-    def calculate_vendor_risk(self) -> pd.DataFrame:
+    @cached_property
+    def _merged(self) -> pd.DataFrame:
+        """关联表与CVE、CPE数据的合并结果，仅计算一次供各分析方法复用"""
+        merged = self._shared_merged
+        if merged is None:
+            merged = merge_data(self.junction_data, self.cve_data, self.cpe_data)
+        return merged.assign(is_critical=(merged['baseSeverity'] == 'CRITICAL').astype('uint8'))
+
+    def calculate_vendor_risk(self, top_n: int = 50) -> pd.DataFrame:
         """计算厂商风险评分"""
-        merged = self.junction_data.merge(self.cve_data, on='cveId', how='left')
-        merged = merged.merge(self.cpe_data[['cpe23Uri', 'vendor', 'product']], on='cpe23Uri', how='left')
+        merged = self._merged
 
-        vendor_stats = merged.groupby('vendor').agg({
+        vendor_stats = merged.groupby('vendor', observed=True).agg({
             'cveId': 'count',
             'baseScore': ['mean', 'max', 'sum'],
-            'baseSeverity': lambda x: (x == 'CRITICAL').sum()
+            'is_critical': 'sum'
         }).reset_index()
 
         vendor_stats.columns = ['vendor', 'cve_count', 'avg_score', 'max_score', 'total_score', 'critical_count']
 
         vendor_stats['risk_score'] = (
-            vendor_stats['cve_count'] * 0.3 +
-            vendor_stats['avg_score'] * 0.25 +
-            vendor_stats['max_score'] * 0.15 +
-            vendor_stats['critical_count'] * 0.3
+            vendor_stats[self.RISK_FACTORS].to_numpy(dtype=np.float64) @ self.VENDOR_RISK_WEIGHTS
         )
 
+        vendor_stats = vendor_stats.nlargest(top_n, 'risk_score')
         vendor_stats['risk_level'] = pd.cut(
             vendor_stats['risk_score'],
             bins=[0, 5, 15, 30, float('inf')],
             labels=['低风险', '中风险', '高风险', '极高风险']
         )
 
-        return vendor_stats.sort_values('risk_score', ascending=False)
+        return vendor_stats
 
     def calculate_product_risk(self, top_n: int = 50) -> pd.DataFrame:
         """计算产品风险评分"""
-        merged = self.junction_data.merge(self.cve_data, on='cveId', how='left')
-        merged = merged.merge(self.cpe_data[['cpe23Uri', 'vendor', 'product']], on='cpe23Uri', how='left')
+        merged = self._merged
 
-        product_stats = merged.groupby(['vendor', 'product']).agg({
+        product_stats = merged.groupby(['vendor', 'product'], observed=True).agg({
             'cveId': 'count',
             'baseScore': ['mean', 'max'],
-            'baseSeverity': lambda x: (x == 'CRITICAL').sum()
+            'is_critical': 'sum'
         }).reset_index()
 
         product_stats.columns = ['vendor', 'product', 'cve_count', 'avg_score', 'max_score', 'critical_count']
 
         product_stats['risk_score'] = (
-            product_stats['cve_count'] * 0.35 +
-            product_stats['avg_score'] * 0.25 +
-            product_stats['max_score'] * 0.15 +
-            product_stats['critical_count'] * 0.25
+            product_stats[self.RISK_FACTORS].to_numpy(dtype=np.float64) @ self.PRODUCT_RISK_WEIGHTS
         )
 
         return product_stats.nlargest(top_n, 'risk_score')
@@ -79,7 +89,8 @@ class RiskAnalyzer:
         """分析漏洞严重程度分布"""
         if 'baseSeverity' not in self.cve_data.columns:
             return {}
-        return self.cve_data['baseSeverity'].value_counts().to_dict()
+        counts = self.cve_data['baseSeverity'].value_counts()
+        return counts[counts > 0].to_dict()
 
     def analyze_yearly_trend(self) -> pd.DataFrame:
         """分析漏洞年度趋势"""
@@ -96,26 +107,22 @@ class RiskAnalyzer:
 
     def identify_high_risk_components(self, threshold: float = 8.0) -> List[Dict]:
         """识别高风险组件"""
-        cpe_cols = ['cpe23Uri', 'vendor', 'product']
-        if 'version' in self.cpe_data.columns:
-            cpe_cols.append('version')
-        merged = self.junction_data.merge(self.cve_data, on='cveId', how='left')
-        merged = merged.merge(self.cpe_data[cpe_cols], on='cpe23Uri', how='left')
-
-        high_risk = merged[merged['baseScore'] >= threshold].head(500)
-
-        components = []
-        for _, row in high_risk.iterrows():
-            components.append({
-                'vendor': row.get('vendor', 'unknown'),
-                'product': row.get('product', 'unknown'),
-                'version': row.get('version', '*') if 'version' in row else '*',
-                'cve_id': row['cveId'],
-                'score': row['baseScore'],
-                'severity': row.get('baseSeverity', 'UNKNOWN')
-            })
-
-        return components
+        merged = self._merged
+
+        columns = ['vendor', 'product', 'version', 'cveId', 'baseScore', 'baseSeverity']
+        high_risk = merged.loc[merged['baseScore'] >= threshold].head(500)
+        high_risk = high_risk.reindex(columns=columns).astype(object).rename(columns={
+            'cveId': 'cve_id',
+            'baseScore': 'score',
+            'baseSeverity': 'severity'
+        })
+
+        return high_risk.fillna({
+            'vendor': 'unknown',
+            'product': 'unknown',
+            'version': '*',
+            'severity': 'UNKNOWN'
+        }).to_dict('records')
 
     def generate_risk_profile(self) -> Dict:
         """生成完整风险画像"""
@@ -126,7 +133,7 @@ class RiskAnalyzer:
                 'severity_distribution': self.analyze_severity_distribution()
             },
             'yearly_trend': self.analyze_yearly_trend().to_dict('records'),
-            'top_risk_vendors': self.calculate_vendor_risk().head(20).to_dict('records'),
+            'top_risk_vendors': self.calculate_vendor_risk(20).to_dict('records'),
             'top_risk_products': self.calculate_product_risk(30).to_dict('records'),
             'critical_components': self.identify_high_risk_components(9.0)[:50]
         }
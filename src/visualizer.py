@@ -2,15 +2,29 @@
 可视化模块
 生成风险分析图表
 """
-import matplotlib.pyplot as plt
-import seaborn as sns
 import pandas as pd
-import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from typing import Optional
 import os
 
-plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
+CHART_DPI = 100
+HEATMAP_DPI = 120
+
+
+@lru_cache(maxsize=None)
+def _load_plotting():
+    """按需导入matplotlib与seaborn并设置图表样式，主进程和每个绘图子进程中各执行一次"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
+    plt.rcParams['axes.unicode_minus'] = False
+    sns.set_style("whitegrid")
+    return plt, sns
 
 
 class RiskVisualizer:
@@ -19,11 +33,11 @@ class RiskVisualizer:
     def __init__(self, output_dir: str = './output'):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
-        sns.set_style("whitegrid")
 
     def plot_severity_distribution(self, severity_data: dict, save: bool = True) -> Optional[str]:
         """绘制漏洞严重程度分布饼图"""
-        fig, ax = plt.subplots(figsize=(10, 8))
+        plt, sns = _load_plotting()
+        fig, ax = plt.subplots(figsize=(10, 8), constrained_layout=True)
 
         labels = list(severity_data.keys())
         sizes = list(severity_data.values())
@@ -46,14 +60,15 @@ class RiskVisualizer:
 
         if save:
             filepath = os.path.join(self.output_dir, 'severity_distribution.png')
-            plt.savefig(filepath, dpi=150, bbox_inches='tight')
+            plt.savefig(filepath, dpi=CHART_DPI)
             plt.close()
             return filepath
         return None
 
     def plot_yearly_trend(self, yearly_data: pd.DataFrame, save: bool = True) -> Optional[str]:
         """绘制漏洞年度趋势图"""
-        fig, ax1 = plt.subplots(figsize=(14, 6))
+        plt, sns = _load_plotting()
+        fig, ax1 = plt.subplots(figsize=(14, 6), constrained_layout=True)
 
         color1 = '#1976d2'
         ax1.bar(yearly_data['year'], yearly_data['cve_count'], color=color1, alpha=0.7, label='CVE Count')
@@ -69,24 +84,25 @@ class RiskVisualizer:
         ax2.tick_params(axis='y', labelcolor=color2)
 
         plt.title('CVE Yearly Trend Analysis', fontsize=14, fontweight='bold')
-        fig.tight_layout()
 
         if save:
             filepath = os.path.join(self.output_dir, 'yearly_trend.png')
-            plt.savefig(filepath, dpi=150, bbox_inches='tight')
+            plt.savefig(filepath, dpi=CHART_DPI)
             plt.close()
             return filepath
         return None
 
     def plot_top_vendors_risk(self, vendor_data: pd.DataFrame, top_n: int = 15, save: bool = True) -> Optional[str]:
         """绘制高风险厂商排行"""
-        fig, ax = plt.subplots(figsize=(12, 8))
+        import numpy as np
+        plt, sns = _load_plotting()
+        fig, ax = plt.subplots(figsize=(12, 8), constrained_layout=True)
 
         data = vendor_data.head(top_n).sort_values('risk_score')
 
         colors = plt.cm.RdYlGn_r(np.linspace(0.2, 0.8, len(data)))
 
-        bars = ax.barh(data['vendor'], data['risk_score'], color=colors)
+        bars = ax.barh(data['vendor'], data['risk_score'], color=colors, rasterized=True)
 
         ax.set_xlabel('Risk Score', fontsize=12)
         ax.set_ylabel('Vendor', fontsize=12)
@@ -96,18 +112,17 @@ class RiskVisualizer:
             ax.text(bar.get_width() + 0.5, bar.get_y() + bar.get_height()/2,
                     f'{score:.1f}', va='center', fontsize=9)
 
-        plt.tight_layout()
-
         if save:
             filepath = os.path.join(self.output_dir, 'top_vendors_risk.png')
-            plt.savefig(filepath, dpi=150, bbox_inches='tight')
+            plt.savefig(filepath, dpi=CHART_DPI)
             plt.close()
             return filepath
         return None
 
     def plot_product_heatmap(self, product_data: pd.DataFrame, save: bool = True) -> Optional[str]:
         """绘制产品风险热力图"""
-        fig, ax = plt.subplots(figsize=(14, 10))
+        plt, sns = _load_plotting()
+        fig, ax = plt.subplots(figsize=(14, 10), constrained_layout=True)
 
         top_products = product_data.head(20)
 
@@ -120,32 +135,31 @@ class RiskVisualizer:
         )
 
         sns.heatmap(pivot_data, annot=True, fmt='.1f', cmap='YlOrRd',
-                    ax=ax, cbar_kws={'label': 'Risk Score'})
+                    ax=ax, cbar_kws={'label': 'Risk Score'}, rasterized=True)
 
         ax.set_title('Product Risk Heatmap', fontsize=14, fontweight='bold')
-        plt.tight_layout()
 
         if save:
             filepath = os.path.join(self.output_dir, 'product_heatmap.png')
-            plt.savefig(filepath, dpi=150, bbox_inches='tight')
+            plt.savefig(filepath, dpi=HEATMAP_DPI)
             plt.close()
             return filepath
         return None
 
     def plot_severity_by_vendor(self, merged_data: pd.DataFrame, top_n: int = 10, save: bool = True) -> Optional[str]:
         """绘制厂商漏洞严重程度堆叠图"""
-        fig, ax = plt.subplots(figsize=(14, 8))
-
-        top_vendors = merged_data['vendor'].value_counts().head(top_n).index.tolist()
-        filtered = merged_data[merged_data['vendor'].isin(top_vendors)]
-
-        severity_counts = filtered.groupby(['vendor', 'baseSeverity']).size().unstack(fill_value=0)
+        plt, sns = _load_plotting()
+        fig, ax = plt.subplots(figsize=(14, 8), constrained_layout=True)
 
+        top_vendors = merged_data['vendor'].value_counts().nlargest(top_n).index
         severity_order = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'NONE']
-        severity_counts = severity_counts.reindex(columns=[c for c in severity_order if c in severity_counts.columns])
+
+        severity_counts = pd.crosstab(merged_data['vendor'], merged_data['baseSeverity']).reindex(
+            index=top_vendors, columns=severity_order, fill_value=0
+        )
 
         colors = ['#d32f2f', '#f57c00', '#fbc02d', '#388e3c', '#757575']
-        severity_counts.plot(kind='bar', stacked=True, ax=ax, color=colors[:len(severity_counts.columns)])
+        severity_counts.plot(kind='bar', stacked=True, ax=ax, color=colors)
 
         ax.set_xlabel('Vendor', fontsize=12)
         ax.set_ylabel('CVE Count', fontsize=12)
@@ -153,43 +167,57 @@ class RiskVisualizer:
         ax.legend(title='Severity', bbox_to_anchor=(1.02, 1), loc='upper left')
 
         plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
 
         if save:
             filepath = os.path.join(self.output_dir, 'severity_by_vendor.png')
-            plt.savefig(filepath, dpi=150, bbox_inches='tight')
+            plt.savefig(filepath, dpi=CHART_DPI)
             plt.close()
             return filepath
         return None
 
-    def generate_all_charts(self, risk_profile: dict, merged_data: pd.DataFrame = None) -> list:
-        """生成所有图表"""
-        generated = []
+    def generate_all_charts(self, risk_profile: dict, merged_data: pd.DataFrame = None,
+                            max_workers: int = 4) -> list:
+        """生成所有图表，各图表相互独立，多核时在多个进程中并行渲染，否则在当前进程中依次渲染"""
+        tasks = []
 
         if 'summary' in risk_profile and 'severity_distribution' in risk_profile['summary']:
-            path = self.plot_severity_distribution(risk_profile['summary']['severity_distribution'])
-            if path:
-                generated.append(path)
+            tasks.append((self.plot_severity_distribution, risk_profile['summary']['severity_distribution']))
 
         if 'yearly_trend' in risk_profile:
             yearly_df = pd.DataFrame(risk_profile['yearly_trend'])
             if not yearly_df.empty:
-                path = self.plot_yearly_trend(yearly_df)
-                if path:
-                    generated.append(path)
+                tasks.append((self.plot_yearly_trend, yearly_df))
 
         if 'top_risk_vendors' in risk_profile:
             vendor_df = pd.DataFrame(risk_profile['top_risk_vendors'])
             if not vendor_df.empty:
-                path = self.plot_top_vendors_risk(vendor_df)
-                if path:
-                    generated.append(path)
+                tasks.append((self.plot_top_vendors_risk, vendor_df))
 
         if 'top_risk_products' in risk_profile:
             product_df = pd.DataFrame(risk_profile['top_risk_products'])
             if not product_df.empty:
-                path = self.plot_product_heatmap(product_df)
-                if path:
-                    generated.append(path)
-
-        return generated
+                tasks.append((self.plot_product_heatmap, product_df))
+
+        workers = min(max_workers, len(tasks), os.cpu_count() or 1)
+        paths = self._render_in_pool(tasks, workers) if workers > 1 else None
+        if paths is None:
+            paths = [plot(data) for plot, data in tasks]
+
+        return [path for path in paths if path]
+
+    def _render_in_pool(self, tasks: list, workers: int) -> Optional[list]:
+        """在进程池中渲染图表，进程池无法创建或崩溃时返回None；单个图表自身的异常直接抛出"""
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_load_plotting)
+        except OSError:
+            return None
+
+        with executor:
+            try:
+                futures = [executor.submit(plot, data) for plot, data in tasks]
+            except (OSError, BrokenProcessPool):
+                return None
+            try:
+                return [future.result() for future in futures]
+            except BrokenProcessPool:
+                return None
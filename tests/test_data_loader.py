@@ -0,0 +1,71 @@
+"""
+数据加载模块测试
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import data_loader
+from data_loader import DataLoader
+
+
+class TestLoadCveData(unittest.TestCase):
+    """CVE数据加载测试"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self._block_size = data_loader.CSV_BLOCK_SIZE
+        self.addCleanup(setattr, data_loader, 'CSV_BLOCK_SIZE', self._block_size)
+
+    def _write_csv(self, lines):
+        filepath = os.path.join(self._tmp.name, 'nvd_cves.csv')
+        with open(filepath, 'w', encoding='utf-8', newline='') as f:
+            f.write("\n".join(lines) + "\n")
+        return filepath
+
+    def test_multiline_descriptions_across_blocks(self):
+        """引号内含换行的描述跨越多个解析块时仍能完整读取"""
+        data_loader.CSV_BLOCK_SIZE = 1 << 10
+        rows = [
+            f'CVE-{i},2021-01-02T10:00Z,"first line\nsecond line of description {i}",7.5,HIGH'
+            for i in range(500)
+        ]
+        filepath = self._write_csv(['cveId,publishedDate,description,baseScore,baseSeverity'] + rows)
+
+        df = DataLoader().load_cve_data(filepath)
+
+        self.assertEqual(len(df), 500)
+        self.assertEqual(df['baseScore'].tolist(), [7.5] * 500)
+        self.assertEqual(set(df['baseSeverity']), {'HIGH'})
+
+    def test_blank_cells_are_missing(self):
+        """空白单元格与pandas一致记为缺失值，而不是空字符串"""
+        filepath = self._write_csv([
+            'cveId,publishedDate,baseScore,baseSeverity',
+            'CVE-1,2021-01-02T10:00Z,9.8,CRITICAL',
+            'CVE-2,2021-01-03T10:00Z,,',
+            'CVE-3,2021-01-04T10:00Z,5.0,N/A',
+        ])
+
+        df = DataLoader().load_cve_data(filepath)
+
+        self.assertEqual(df['baseSeverity'].isna().tolist(), [False, True, True])
+        self.assertNotIn('', df['baseSeverity'].cat.categories)
+
+    def test_severity_normalization(self):
+        """严重程度统一为大写，纯空白记为缺失，非标准取值保留为额外分类"""
+        severity = data_loader._to_severity(pd.Series(['medium', ' HIGH ', '   ', 'unknown', None]))
+
+        self.assertEqual(severity.iloc[:2].tolist(), ['MEDIUM', 'HIGH'])
+        self.assertTrue(severity.iloc[2:3].isna().all() and severity.iloc[4:].isna().all())
+        self.assertEqual(list(severity.cat.categories), ['UNKNOWN'] + data_loader.SEVERITY_LEVELS)
+
+
+if __name__ == '__main__':
+    unittest.main()